@@ -7,13 +7,39 @@ Outputs one PNG per unique (origin, destination, departure_date) series.
 from __future__ import annotations
 
 import argparse
-from dataclasses import dataclass
+import functools
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
 
+import matplotlib
 import matplotlib.dates as mdates
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
+from matplotlib.axes import Axes
+from matplotlib.figure import Figure
+
+SERIES_KEY_TYPE = pa.dictionary(pa.int32(), pa.string())
+CSV_COLUMN_TYPES = {
+    "timestamp_utc": pa.string(),
+    "origin": SERIES_KEY_TYPE,
+    "destination": SERIES_KEY_TYPE,
+    "departure_date": SERIES_KEY_TYPE,
+    "price": pa.string(),
+}
+
+# Matches the scraper's timestamp_utc values (naive UTC, second precision).
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S"
+PRICE_SYMBOLS = ("£", ",")
+NUMBER_PATTERN = r"^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$"
+SUBPLOT_SIDES = ("left", "right", "top", "bottom")
 
 
 @dataclass(frozen=True)
@@ -21,69 +47,228 @@ class PlotConfig:
     csv_path: Path
     output_dir: Path
     currency: str
+    # JSON manifest of per-chart data digests; None disables skipping.
+    digest_path: Path | None = None
 
 
-def _parse_price(value: str) -> Optional[float]:
-    if not isinstance(value, str):
-        return None
-    cleaned = value.strip()
-    if not cleaned:
-        return None
-    cleaned = cleaned.replace("£", "").replace(",", "")
-    try:
-        return float(cleaned)
-    except ValueError:
-        return None
+@dataclass(frozen=True)
+class ChartRun:
+    generated: list[Path] = field(default_factory=list)
+    skipped: list[Path] = field(default_factory=list)
+
+
+def _parse_prices(prices: pd.Series) -> pd.Series:
+    cleaned = pa.array(prices.astype("string[pyarrow]"))
+    for symbol in PRICE_SYMBOLS:
+        cleaned = pc.replace_substring(cleaned, symbol, "")
+    cleaned = pc.utf8_trim_whitespace(cleaned)
+    # Arrow's cast has no "coerce" mode, so null out anything that isn't a
+    # plain decimal number before converting.
+    is_number = pc.match_substring_regex(cleaned, NUMBER_PATTERN)
+    numeric = pc.if_else(is_number, cleaned, None)
+    values = pc.cast(numeric, pa.float64()).to_numpy(zero_copy_only=False)
+    return pd.Series(values, index=prices.index)
+
+
+class _SlugTable(dict[int, str]):
+    """str.translate() table mapping anything but alphanumerics, - and _ to -.
+
+    Entries are computed on first lookup and cached, so non-ASCII input is
+    handled the same way as ASCII.
+    """
+
+    def __missing__(self, codepoint: int) -> str:
+        char = chr(codepoint)
+        replacement = char if char.isalnum() or char in "-_" else "-"
+        self[codepoint] = replacement
+        return replacement
+
+
+_SLUG_TABLE = _SlugTable()
 
 
 def _slugify(value: str) -> str:
-    return "".join(ch if ch.isalnum() or ch in ("-", "_") else "-" for ch in value)
+    return value.translate(_SLUG_TABLE)
+
+
+@functools.cache
+def _figure() -> tuple[Figure, Axes]:
+    """Return the figure reused for every chart rendered by this process."""
+    return plt.subplots(figsize=(10, 6))
+
+
+def _chart_path(
+    output_dir: Path, origin: str, destination: str, departure_date: str
+) -> Path:
+    filename = "_".join(
+        [
+            _slugify(origin),
+            _slugify(destination),
+            _slugify(departure_date),
+        ]
+    )
+    return output_dir / f"{filename}.png"
+
+
+def _series_digest(
+    capture_dates: np.ndarray, price_values: np.ndarray, currency: str
+) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.ascontiguousarray(capture_dates).tobytes())
+    digest.update(np.ascontiguousarray(price_values).tobytes())
+    digest.update(currency.encode("utf-8"))
+    return digest.hexdigest()
 
 
-def build_charts(config: PlotConfig) -> list[Path]:
-    df = pd.read_csv(config.csv_path)
+def _load_digests(digest_path: Path | None) -> dict[str, str]:
+    if digest_path is None:
+        return {}
+    try:
+        digests = json.loads(digest_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return digests if isinstance(digests, dict) else {}
+
+
+def _save_digests(digest_path: Path | None, digests: dict[str, str]) -> None:
+    if digest_path is None:
+        return
+    digest_path.parent.mkdir(parents=True, exist_ok=True)
+    digest_path.write_text(json.dumps(digests, sort_keys=True), encoding="utf-8")
+
+
+def _render_one(
+    item: tuple[str, str, str, np.ndarray, np.ndarray, Path, str],
+) -> Path:
+    (
+        origin,
+        destination,
+        departure_date,
+        capture_dates,
+        price_values,
+        output_path,
+        currency,
+    ) = item
+    fig, ax = _figure()
+    ax.clear()
+    # tight_layout() starts from the current margins, so undo the previous
+    # chart's layout to keep output identical to a fresh figure.
+    fig.subplots_adjust(
+        **{side: plt.rcParams[f"figure.subplot.{side}"] for side in SUBPLOT_SIDES}
+    )
+    ax.plot(capture_dates, price_values, marker="o")
+    ax.set_title(f"{origin} → {destination} ({departure_date})")
+    ax.set_xlabel("Capture date")
+    ax.set_ylabel(f"Price ({currency})")
+    ax.grid(True, linestyle="--", alpha=0.5)
+    ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m-%d"))
+    fig.autofmt_xdate()
+
+    fig.tight_layout()
+    # tight_layout() leaves a placeholder layout engine behind, which makes
+    # savefig() run an extra full draw pass before rendering; drop it.
+    fig.set_layout_engine(None)
+    fig.savefig(output_path, dpi=150, pil_kwargs={"compress_level": 3})
+    return output_path
+
+
+def build_charts(config: PlotConfig) -> ChartRun:
+    table = pv.read_csv(
+        config.csv_path,
+        convert_options=pv.ConvertOptions(
+            column_types=CSV_COLUMN_TYPES,
+            include_columns=list(CSV_COLUMN_TYPES),
+        ),
+    )
+    # Dictionary-encoded series keys become pandas categoricals; the string
+    # columns stay Arrow-backed for the vectorized parsing below.
+    df = table.to_pandas(
+        types_mapper=lambda arrow_type: (
+            None if pa.types.is_dictionary(arrow_type) else pd.ArrowDtype(arrow_type)
+        )
+    )
     if df.empty:
-        return []
+        return ChartRun()
 
-    df = df.copy()
     config.output_dir.mkdir(parents=True, exist_ok=True)
-    df["capture_date"] = pd.to_datetime(df["timestamp_utc"], errors="coerce")
-    df["price_value"] = df["price"].apply(_parse_price)
-    df = df.dropna(subset=["capture_date", "price_value"])
-    if df.empty:
-        return []
+    capture_dates = pc.strptime(
+        pa.array(df["timestamp_utc"]),
+        format=TIMESTAMP_FORMAT,
+        unit="s",
+        error_is_null=True,
+    ).to_numpy(zero_copy_only=False)
+    price_values = _parse_prices(df["price"]).to_numpy()
+    valid = ~np.isnat(capture_dates) & ~np.isnan(price_values)
+    if not valid.any():
+        return ChartRun()
+
+    capture_dates = capture_dates[valid]
+    price_values = price_values[valid]
+    key_columns = [
+        df[column].cat for column in ("origin", "destination", "departure_date")
+    ]
+    key_shape = tuple(len(keys.categories) for keys in key_columns)
+    series_codes = np.ravel_multi_index(
+        [keys.codes.to_numpy()[valid] for keys in key_columns], key_shape
+    )
 
-    df = df.sort_values("capture_date")
+    # Sort by series, then capture date, so each series becomes a contiguous
+    # date-ordered run of rows that can be sliced without copying. Series
+    # come out ordered by origin, destination, then departure_date category
+    # code (codes follow first appearance within each column), not by the
+    # order in which whole series first appear.
+    order = np.lexsort((capture_dates, series_codes))
+    series_codes = series_codes[order]
+    capture_dates = capture_dates[order]
+    price_values = price_values[order]
+    boundaries = np.flatnonzero(np.diff(series_codes)) + 1
+    starts = np.concatenate(([0], boundaries))
+    ends = np.concatenate((boundaries, [len(order)]))
+    series_keys = zip(
+        *(
+            keys.categories[codes]
+            for keys, codes in zip(
+                key_columns, np.unravel_index(series_codes[starts], key_shape)
+            )
+        )
+    )
 
-    output_paths: list[Path] = []
-    group_columns = ["origin", "destination", "departure_date"]
-    for (origin, destination, departure_date), group in df.groupby(group_columns):
-        if group.empty:
+    run = ChartRun()
+    digests = _load_digests(config.digest_path)
+    items = []
+    for (origin, destination, departure_date), start, end in zip(
+        series_keys, starts, ends
+    ):
+        output_path = _chart_path(
+            config.output_dir, origin, destination, departure_date
+        )
+        series_dates = capture_dates[start:end]
+        series_prices = price_values[start:end]
+        digest = _series_digest(series_dates, series_prices, config.currency)
+        if digests.get(str(output_path)) == digest and output_path.exists():
+            run.skipped.append(output_path)
             continue
-        fig, ax = plt.subplots(figsize=(10, 6))
-        ax.plot(group["capture_date"], group["price_value"], marker="o")
-        ax.set_title(f"{origin} → {destination} ({departure_date})")
-        ax.set_xlabel("Capture date")
-        ax.set_ylabel(f"Price ({config.currency})")
-        ax.grid(True, linestyle="--", alpha=0.5)
-        ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m-%d"))
-        fig.autofmt_xdate()
-
-        filename = "_".join(
-            [
-                _slugify(origin),
-                _slugify(destination),
-                _slugify(departure_date),
-            ]
+        digests[str(output_path)] = digest
+        run.generated.append(output_path)
+        items.append(
+            (
+                origin,
+                destination,
+                departure_date,
+                series_dates,
+                series_prices,
+                output_path,
+                config.currency,
+            )
         )
-        output_path = config.output_dir / f"{filename}.png"
-        config.output_dir.mkdir(parents=True, exist_ok=True)
-        fig.tight_layout()
-        fig.savefig(output_path, dpi=150)
-        plt.close(fig)
-        output_paths.append(output_path)
 
-    return output_paths
+    if items:
+        with ProcessPoolExecutor(
+            max_workers=os.cpu_count(), initializer=matplotlib.use, initargs=("Agg",)
+        ) as executor:
+            list(executor.map(_render_one, items))
+        _save_digests(config.digest_path, digests)
+    return run
 
 
 def main() -> None:
@@ -105,15 +290,25 @@ def main() -> None:
         default="GBP",
         help="Currency label to display on charts.",
     )
+    parser.add_argument(
+        "--digest-path",
+        type=Path,
+        default=Path(".cache/chart_digests.json"),
+        help="Manifest of chart data digests used to skip unchanged charts.",
+    )
     args = parser.parse_args()
 
     config = PlotConfig(
         csv_path=args.csv_path,
         output_dir=args.output_dir,
         currency=args.currency,
+        digest_path=args.digest_path,
+    )
+    run = build_charts(config)
+    print(
+        f"Generated {len(run.generated)} chart(s), "
+        f"skipped {len(run.skipped)} unchanged."
     )
-    output_paths = build_charts(config)
-    print(f"Generated {len(output_paths)} chart(s).")
 
 
 if __name__ == "__main__":
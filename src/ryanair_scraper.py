@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-"""Ryanair price tracker using Selenium.
+"""Ryanair price tracker using the availability API, with a Selenium fallback.
 
 This script is designed to run in CI (e.g., GitHub Actions) or locally.
 It records a daily price point for a fixed route/date pairing into a CSV file.
@@ -10,21 +10,162 @@ from __future__ import annotations
 import argparse
 import csv
 import datetime as dt
+import fcntl
+import http.client
+import json
 import logging
+import multiprocessing
+import multiprocessing.util
+import os
 import re
-from dataclasses import dataclass
+import signal
+import socket
+import socketserver
+import stat
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field, fields, replace
+from functools import partial
 from pathlib import Path
-from typing import Optional
+from typing import IO, Any, Callable, Iterable, Iterator, Optional, Sequence, Union
+from urllib.parse import urlencode, urlsplit
 
 from selenium import webdriver
-from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.common.exceptions import (
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support.ui import WebDriverWait
 
+logger = logging.getLogger("ryanair_scraper")
+
 BASE_URL = "https://www.ryanair.com/gb/en"
-CSV_HEADERS = [
+AVAILABILITY_URL = "https://www.ryanair.com/api/booking/v4/en-gb/availability"
+API_HEADERS = {
+    "Accept": "application/json",
+    "User-Agent": (
+        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36"
+        " (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
+    ),
+}
+COOKIE_SELECTORS: tuple[tuple[By, str], ...] = (
+    (By.CSS_SELECTOR, "button[data-ref='cookie.accept-all']"),
+    (By.CSS_SELECTOR, "button[data-ref='cookie.popup.accept-all']"),
+    (By.CSS_SELECTOR, "button[data-testid='accept-all-cookies']"),
+    (By.CSS_SELECTOR, "button#cookie-popup-with-overlay-accept"),
+    (
+        By.XPATH,
+        "//button[contains(translate(.,"
+        " 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'),"
+        " 'accept')"
+        " and contains(translate(.,"
+        " 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'),"
+        " 'cookie')]",
+    ),
+)
+FLIGHT_CARD_SELECTORS: tuple[tuple[By, str], ...] = (
+    (By.CSS_SELECTOR, "[data-ref='flight-card']"),
+    (By.CSS_SELECTOR, "[data-testid='flight-card']"),
+    (By.CSS_SELECTOR, ".flight-card"),
+    (By.CSS_SELECTOR, "[data-ref='flight-card-container']"),
+)
+PRICE_SELECTORS: tuple[tuple[By, str], ...] = (
+    (By.CSS_SELECTOR, "[data-ref='price']"),
+    (By.CSS_SELECTOR, "[data-testid='price']"),
+    (By.CSS_SELECTOR, "[data-testid='price-value']"),
+    (By.CSS_SELECTOR, "[data-testid='flight-price']"),
+    (By.CSS_SELECTOR, "[data-e2e='flight-price']"),
+    (By.CSS_SELECTOR, ".flight-card__price"),
+    (By.CSS_SELECTOR, ".flight-price"),
+    (By.CSS_SELECTOR, ".price"),
+)
+TIME_SELECTORS: tuple[tuple[By, str], ...] = (
+    (By.CSS_SELECTOR, "[data-ref='flight-time']"),
+    (By.CSS_SELECTOR, "[data-testid='flight-time']"),
+    (By.CSS_SELECTOR, ".flight-card__time"),
+    (By.CSS_SELECTOR, ".flight-time"),
+    (By.CSS_SELECTOR, ".flight-info__hour"),
+)
+# In-browser equivalents of _clean_text/_extract_element_text.
+ELEMENT_TEXT_JS = """
+const clean = (value) => (value || "").split(/\\s+/).filter(Boolean).join(" ");
+const elementText = (element) => {
+  for (const value of [
+    element.innerText,
+    element.textContent,
+    element.getAttribute("aria-label"),
+    element.getAttribute("data-label"),
+  ]) {
+    const cleaned = clean(value);
+    if (cleaned) return cleaned;
+  }
+  return "";
+};
+"""
+# Reads price/time text from every card in one round-trip. For each card the
+# first selector with non-empty text wins, in list order.
+CARD_EXTRACTION_SCRIPT = ELEMENT_TEXT_JS + """
+const [cards, priceSelectors, timeSelectors] = arguments;
+return cards.map((card) => {
+  let price = "";
+  for (const selector of priceSelectors) {
+    const target = card.querySelector(selector);
+    price = target ? elementText(target) : "";
+    if (price) break;
+  }
+  let times = [];
+  for (const selector of timeSelectors) {
+    times = Array.from(card.querySelectorAll(selector), (target) =>
+      target.innerText.trim()
+    ).filter(Boolean);
+    if (times.length) break;
+  }
+  return {price: price, times: times, text: price ? "" : elementText(card)};
+});
+"""
+# First non-empty text across the whole page, tried selector by selector.
+PAGE_TEXT_SCRIPT = ELEMENT_TEXT_JS + """
+const [selectors] = arguments;
+for (const selector of selectors) {
+  for (const element of document.querySelectorAll(selector)) {
+    const text = elementText(element);
+    if (text) return text;
+  }
+}
+return "";
+"""
+POLL_FREQUENCY = 0.1
+# Tried in order: symbol-prefixed prices win over currency codes.
+PRICE_PATTERNS: tuple[re.Pattern[str], ...] = tuple(
+    re.compile(pattern)
+    for pattern in (
+        r"(£|€|\$)\s*\d+(?:[.,]\d{2})?",
+        r"\d+(?:[.,]\d{2})?\s*(£|€|\$)",
+        r"\b(?:GBP|EUR|USD)\s*\d+(?:[.,]\d{2})?\b",
+        r"\d+(?:[.,]\d{2})?\s*(?:GBP|EUR|USD)\b",
+    )
+)
+CURRENCY_SYMBOLS = {"GBP": "£", "EUR": "€", "USD": "$"}
+BLOCKED_URL_PATTERNS = [
+    "*.png",
+    "*.jpg",
+    "*.jpeg",
+    "*.gif",
+    "*.webp",
+    "*.woff",
+    "*.woff2",
+    "*.mp4",
+    "*/analytics/*",
+    "*/gtm*",
+    "*googletagmanager*",
+    "*google-analytics*",
+    "*facebook*",
+    "*hotjar*",
+]
+CSV_HEADERS = (
     "timestamp_utc",
     "origin",
     "destination",
@@ -32,10 +173,13 @@ CSV_HEADERS = [
     "arrival_date",
     "price",
     "currency",
-]
+)
 
+_WORKER_SLOT: Optional[int] = None
+_WORKER_FETCHER: Optional[FlightFetcher] = None
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class SearchConfig:
     origin: str
     destination: str
@@ -43,12 +187,28 @@ class SearchConfig:
     date_return: str
     adults: int = 1
     currency: str = "GBP"
+    _search_url: str = field(init=False, repr=False, compare=False)
+    _availability_url: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Frozen, so the URLs are built once per search and then reused.
+        object.__setattr__(self, "_search_url", self._build_search_url())
+        object.__setattr__(
+            self, "_availability_url", self._build_availability_url()
+        )
 
     def to_search_url(self) -> str:
-        """Build a Ryanair search URL.
+        """Return the Ryanair search URL.
 
         Note: Ryanair may update their URL format. Adjust as needed.
         """
+        return self._search_url
+
+    def to_availability_url(self) -> str:
+        """Return the Ryanair availability API URL for the same search."""
+        return self._availability_url
+
+    def _build_search_url(self) -> str:
         return (
             f"{BASE_URL}/trip/flights/select?"
             f"adults={self.adults}"
@@ -65,8 +225,30 @@ class SearchConfig:
             f"&currency={self.currency}"
         )
 
+    def _build_availability_url(self) -> str:
+        params = {
+            "ADT": self.adults,
+            "TEEN": 0,
+            "CHD": 0,
+            "INF": 0,
+            "Origin": self.origin,
+            "Destination": self.destination,
+            "DateOut": self.date_out,
+            "DateIn": self.date_return,
+            "RoundTrip": "true",
+            "FlexDaysBeforeOut": 0,
+            "FlexDaysOut": 0,
+            "FlexDaysBeforeIn": 0,
+            "FlexDaysIn": 0,
+            "IncludeConnectingFlights": "false",
+            "Disc": 0,
+            "promoCode": "",
+            "ToUs": "AGREED",
+        }
+        return f"{AVAILABILITY_URL}?{urlencode(params)}"
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class FlightOption:
     price: Optional[str]
     departure_time: str
@@ -75,12 +257,190 @@ class FlightOption:
     flight_date: str
 
 
+def format_price(amount: float, currency: str) -> str:
+    symbol = CURRENCY_SYMBOLS.get(currency)
+    if symbol:
+        return f"{symbol}{amount:.2f}"
+    return f"{amount:.2f} {currency}"
+
+
+def parse_availability(
+    payload: dict[str, Any], config: SearchConfig
+) -> list[FlightOption]:
+    """Convert an availability API response into flight options."""
+    currency = payload.get("currency") or config.currency
+    options: list[FlightOption] = []
+    for trip in payload.get("trips") or []:
+        is_return_leg = trip.get("origin") == config.destination
+        flight_date = config.date_return if is_return_leg else config.date_out
+        for date_entry in trip.get("dates") or []:
+            for flight in date_entry.get("flights") or []:
+                fares = (flight.get("regularFare") or {}).get("fares") or []
+                amount = fares[0].get("amount") if fares else None
+                times = flight.get("time") or []
+                options.append(
+                    FlightOption(
+                        price=(
+                            format_price(amount, currency)
+                            if amount is not None
+                            else None
+                        ),
+                        departure_time=times[0][11:16] if len(times) > 0 else "",
+                        arrival_time=times[1][11:16] if len(times) > 1 else "",
+                        currency=currency,
+                        flight_date=flight_date,
+                    )
+                )
+    return options
+
+
+class RyanairApiClient:
+    """Availability API client reusing one keep-alive HTTPS connection."""
+
+    def __init__(self, timeout: int) -> None:
+        self.timeout = timeout
+        self.connection: Optional[http.client.HTTPSConnection] = None
+
+    def _request(self, host: str, target: str) -> tuple[int, bytes]:
+        if self.connection is None:
+            self.connection = http.client.HTTPSConnection(host, timeout=self.timeout)
+        try:
+            self.connection.request("GET", target, headers=API_HEADERS)
+            response = self.connection.getresponse()
+            return response.status, response.read()
+        except (OSError, http.client.HTTPException):
+            self.close()
+            raise
+
+    def _get(self, url: str) -> bytes:
+        parts = urlsplit(url)
+        target = f"{parts.path}?{parts.query}"
+        reused = self.connection is not None
+        try:
+            status, body = self._request(parts.netloc, target)
+        except (OSError, http.client.HTTPException) as exc:
+            if not reused:
+                raise OSError(f"Availability API request failed: {exc}") from exc
+            # The server may have dropped the idle keep-alive; retry once.
+            try:
+                status, body = self._request(parts.netloc, target)
+            except (OSError, http.client.HTTPException) as retry_exc:
+                raise OSError(
+                    f"Availability API request failed: {retry_exc}"
+                ) from retry_exc
+        if status != 200:
+            raise OSError(f"Availability API returned HTTP {status}")
+        return body
+
+    def fetch_return_flights(self, config: SearchConfig) -> list[FlightOption]:
+        """Fetch return flight options from the Ryanair availability API.
+
+        Raises OSError for network/HTTP failures and ValueError for bad JSON,
+        including error-shaped bodies without a "trips" list.
+        """
+        url = config.to_availability_url()
+        logger.info("Requesting %s", url)
+        payload = json.loads(self._get(url))
+        if not isinstance(payload, dict) or "trips" not in payload:
+            raise ValueError(f"Availability API returned no trips: {payload!r:.200}")
+        options = parse_availability(payload, config)
+        logger.info("Found %s flight options via API", len(options))
+        return options
+
+    def close(self) -> None:
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+def _any_present(
+    selectors: Sequence[tuple[str, str]],
+) -> Callable[[webdriver.Chrome], Union[list[WebElement], bool]]:
+    """Wait condition returning the matches of the first selector that hits.
+
+    Selectors must be CSS: each poll is one query for their union, and the
+    per-selector lookups (which keep the priority order) only run on a hit.
+    """
+    union = ", ".join(selector for _, selector in selectors)
+
+    def condition(driver: webdriver.Chrome) -> Union[list[WebElement], bool]:
+        if not driver.find_elements(By.CSS_SELECTOR, union):
+            return False
+        for by, selector in selectors:
+            elements = driver.find_elements(by, selector)
+            if elements:
+                return elements
+        return False
+
+    return condition
+
+
+def _any_clickable(
+    selectors: Sequence[tuple[str, str]],
+) -> Callable[[webdriver.Chrome], Union[tuple[tuple[str, str], WebElement], bool]]:
+    """Wait condition returning the first visible, enabled match and its selector."""
+
+    def condition(
+        driver: webdriver.Chrome,
+    ) -> Union[tuple[tuple[str, str], WebElement], bool]:
+        for by, selector in selectors:
+            for element in driver.find_elements(by, selector):
+                try:
+                    if element.is_displayed() and element.is_enabled():
+                        return (by, selector), element
+                except StaleElementReferenceException:
+                    continue
+        return False
+
+    return condition
+
+
 class RyanairScraper:
-    def __init__(self, headless: bool, debug_dir: Optional[Path], timeout: int) -> None:
+    def __init__(
+        self,
+        headless: bool,
+        debug_dir: Optional[Path],
+        timeout: int,
+        profile_dir: Optional[Path] = None,
+    ) -> None:
         self.headless = headless
         self.debug_dir = debug_dir
         self.timeout = timeout
-        self.driver = self._build_driver()
+        self._profile_lock: Optional[IO[str]] = None
+        if profile_dir and not self._lock_profile(profile_dir):
+            logger.warning(
+                "Chrome profile %s is in use by another run; "
+                "starting with a fresh profile",
+                profile_dir,
+            )
+            profile_dir = None
+        self.profile_dir = profile_dir
+        self.cookies_accepted = False
+        self._debug_pool = ThreadPoolExecutor(max_workers=1)
+        if debug_dir:
+            debug_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            self.driver = self._build_driver()
+        except WebDriverException:
+            self._unlock_profile()
+            raise
+
+    def _lock_profile(self, profile_dir: Path) -> bool:
+        """Hold profile_dir for this scraper; False when another run holds it."""
+        profile_dir.mkdir(parents=True, exist_ok=True)
+        handle = (profile_dir / "ryantrak.lock").open("w")
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            handle.close()
+            return False
+        self._profile_lock = handle
+        return True
+
+    def _unlock_profile(self) -> None:
+        if self._profile_lock is not None:
+            self._profile_lock.close()
+            self._profile_lock = None
 
     def _build_driver(self) -> webdriver.Chrome:
         options = Options()
@@ -88,62 +448,80 @@ class RyanairScraper:
         options.add_argument("--disable-gpu")
         options.add_argument("--no-sandbox")
         options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--disable-extensions")
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        if self.profile_dir:
+            options.add_argument(f"--user-data-dir={self.profile_dir.resolve()}")
+        options.add_experimental_option(
+            "prefs", {"profile.managed_default_content_settings.images": 2}
+        )
+        options.page_load_strategy = "eager"
         if self.headless:
             options.add_argument("--headless=new")
         try:
             driver = webdriver.Chrome(options=options)
         except WebDriverException as exc:
-            logging.exception("Failed to start Chrome driver")
+            logger.exception("Failed to start Chrome driver")
             raise exc
         driver.set_page_load_timeout(self.timeout)
+        driver.implicitly_wait(0)
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd(
+            "Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS}
+        )
         return driver
 
     def close(self) -> None:
-        self.driver.quit()
+        self._debug_pool.shutdown(wait=True)
+        try:
+            self.driver.quit()
+        finally:
+            self._unlock_profile()
 
-    def _save_debug_artifacts(self, label: str) -> None:
+    def _save_debug_artifacts(self, label: str, config: SearchConfig) -> None:
         if not self.debug_dir:
             return
-        self.debug_dir.mkdir(parents=True, exist_ok=True)
-        timestamp = dt.datetime.utcnow().strftime("%Y%m%d-%H%M%S")
-        screenshot_path = self.debug_dir / f"{label}-{timestamp}.png"
-        html_path = self.debug_dir / f"{label}-{timestamp}.html"
+        timestamp = dt.datetime.now(dt.timezone.utc).strftime("%Y%m%d-%H%M%S")
+        # Parallel workers share debug_dir, so name the route in every file.
+        stem = (
+            f"{label}_{config.origin}-{config.destination}"
+            f"_{config.date_out}_{config.date_return}_{timestamp}"
+        )
+        # Capture now, while the driver still shows the failing page; only the
+        # disk writes are handed to the background thread.
         try:
-            self.driver.save_screenshot(str(screenshot_path))
-            html_path.write_text(self.driver.page_source, encoding="utf-8")
-            logging.info("Saved debug artifacts to %s", self.debug_dir)
+            screenshot = self.driver.get_screenshot_as_png()
+            html = self.driver.page_source
         except WebDriverException:
-            logging.exception("Failed to write debug artifacts")
+            logger.exception("Failed to capture debug artifacts")
+            return
+        self._debug_pool.submit(
+            self._write_debug_artifacts,
+            self.debug_dir / stem,
+            screenshot,
+            html,
+        )
+
+    @staticmethod
+    def _write_debug_artifacts(stem: Path, screenshot: bytes, html: str) -> None:
+        try:
+            stem.with_suffix(".png").write_bytes(screenshot)
+            stem.with_suffix(".html").write_text(html, encoding="utf-8")
+            logger.info("Saved debug artifacts to %s", stem.parent)
+        except OSError:
+            logger.exception("Failed to write debug artifacts")
 
     def _accept_cookies(self) -> None:
-        selectors: tuple[tuple[By, str], ...] = (
-            (By.CSS_SELECTOR, "button[data-ref='cookie.accept-all']"),
-            (By.CSS_SELECTOR, "button[data-ref='cookie.popup.accept-all']"),
-            (By.CSS_SELECTOR, "button[data-testid='accept-all-cookies']"),
-            (By.CSS_SELECTOR, "button#cookie-popup-with-overlay-accept"),
-            (
-                By.XPATH,
-                "//button[contains(translate(.,"
-                " 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'),"
-                " 'accept')"
-                " and contains(translate(.,"
-                " 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'),"
-                " 'cookie')]",
-            ),
-        )
-        for by, selector in selectors:
-            try:
-                button = WebDriverWait(self.driver, 5).until(
-                    EC.element_to_be_clickable((by, selector))
-                )
-                button.click()
-                logging.info("Accepted cookies banner using selector: %s", selector)
-                return
-            except TimeoutException:
-                continue
-            except WebDriverException:
-                logging.exception("Failed to accept cookies banner")
-                return
+        wait = WebDriverWait(self.driver, 5, poll_frequency=POLL_FREQUENCY)
+        try:
+            (_, selector), button = wait.until(_any_clickable(COOKIE_SELECTORS))
+            button.click()
+        except TimeoutException:
+            return
+        except WebDriverException:
+            logger.exception("Failed to accept cookies banner")
+            return
+        logger.info("Accepted cookies banner using selector: %s", selector)
 
     @staticmethod
     def _clean_text(text: str) -> str:
@@ -152,147 +530,82 @@ class RyanairScraper:
     def _extract_element_text(
         self, element: webdriver.remote.webelement.WebElement
     ) -> str:
-        attributes = ("textContent", "innerText", "aria-label", "data-label")
-        candidates = [element.text]
-        for attribute in attributes:
+        cleaned = self._clean_text(element.text)
+        if cleaned:
+            return cleaned
+        for attribute in ("textContent", "innerText", "aria-label", "data-label"):
             try:
                 value = element.get_attribute(attribute)
             except WebDriverException:
-                value = None
-            if value:
-                candidates.append(value)
-        for candidate in candidates:
-            cleaned = self._clean_text(candidate)
+                continue
+            cleaned = self._clean_text(value or "")
             if cleaned:
                 return cleaned
         return ""
 
-    def _extract_text(
-        self,
-        element: webdriver.remote.webelement.WebElement,
-        selectors: tuple[tuple[By, str], ...],
-    ) -> str:
-        for by, selector in selectors:
-            try:
-                target = element.find_element(by, selector)
-            except WebDriverException:
-                continue
-            text = self._extract_element_text(target)
-            if text:
-                return text
-        return ""
-
     def _extract_page_text(
         self, wait: WebDriverWait, selectors: tuple[tuple[By, str], ...]
     ) -> str:
-        for by, selector in selectors:
-            try:
-                wait.until(EC.presence_of_element_located((by, selector)))
-            except TimeoutException:
-                continue
-            elements = self.driver.find_elements(by, selector)
-            for element in elements:
-                text = self._extract_element_text(element)
-                if text:
-                    return text
-        return ""
+        try:
+            wait.until(_any_present(selectors))
+        except TimeoutException:
+            return ""
+        return self.driver.execute_script(
+            PAGE_TEXT_SCRIPT, [selector for _, selector in selectors]
+        )
 
     @staticmethod
     def _extract_price_from_text(text: str) -> str:
         cleaned = RyanairScraper._clean_text(text)
         if not cleaned:
             return ""
-        patterns = (
-            r"(£|€|\$)\s*\d+(?:[.,]\d{2})?",
-            r"\d+(?:[.,]\d{2})?\s*(£|€|\$)",
-            r"\b(?:GBP|EUR|USD)\s*\d+(?:[.,]\d{2})?\b",
-            r"\d+(?:[.,]\d{2})?\s*(?:GBP|EUR|USD)\b",
-        )
-        for pattern in patterns:
-            match = re.search(pattern, cleaned)
+        for pattern in PRICE_PATTERNS:
+            match = pattern.search(cleaned)
             if match:
                 return match.group(0).strip()
         return ""
 
-    def _extract_times(
-        self,
-        element: webdriver.remote.webelement.WebElement,
-        selectors: tuple[tuple[By, str], ...],
-    ) -> list[str]:
-        for by, selector in selectors:
-            try:
-                targets = element.find_elements(by, selector)
-            except WebDriverException:
-                continue
-            times = [target.text.strip() for target in targets if target.text.strip()]
-            if times:
-                return times
-        return []
-
     def _locate_flight_cards(
         self, wait: WebDriverWait
     ) -> list[webdriver.remote.webelement.WebElement]:
-        selectors: tuple[tuple[By, str], ...] = (
-            (By.CSS_SELECTOR, "[data-ref='flight-card']"),
-            (By.CSS_SELECTOR, "[data-testid='flight-card']"),
-            (By.CSS_SELECTOR, ".flight-card"),
-            (By.CSS_SELECTOR, "[data-ref='flight-card-container']"),
+        try:
+            return wait.until(_any_present(FLIGHT_CARD_SELECTORS))
+        except TimeoutException:
+            return []
+
+    def _extract_cards(
+        self, cards: list[webdriver.remote.webelement.WebElement]
+    ) -> list[dict[str, Any]]:
+        return self.driver.execute_script(
+            CARD_EXTRACTION_SCRIPT,
+            cards,
+            [selector for _, selector in PRICE_SELECTORS],
+            [selector for _, selector in TIME_SELECTORS],
         )
-        for by, selector in selectors:
-            try:
-                wait.until(EC.presence_of_element_located((by, selector)))
-            except TimeoutException:
-                continue
-            cards = self.driver.find_elements(by, selector)
-            if cards:
-                return cards
-        return []
 
     def fetch_return_flights(self, config: SearchConfig) -> list[FlightOption]:
         """Fetch return flight options from Ryanair booking flow."""
         search_url = config.to_search_url()
-        logging.info("Navigating to %s", search_url)
+        logger.info("Navigating to %s", search_url)
         try:
             self.driver.get(search_url)
         except TimeoutException:
-            logging.warning("Timeout while loading the search URL")
-            self._save_debug_artifacts("timeout")
-            return [
-                FlightOption(
-                    price=None,
-                    departure_time="",
-                    arrival_time="",
-                    currency=config.currency,
-                    flight_date=config.date_out,
-                )
-            ]
+            logger.warning("Timeout while loading the search URL")
+            self._save_debug_artifacts("timeout", config)
+            return missing_flights(config)
 
         try:
-            wait = WebDriverWait(self.driver, self.timeout)
-            self._accept_cookies()
+            wait = WebDriverWait(
+                self.driver, self.timeout, poll_frequency=POLL_FREQUENCY
+            )
+            if not self.cookies_accepted:
+                self._accept_cookies()
+                self.cookies_accepted = True
 
             flight_cards = self._locate_flight_cards(wait)
 
-            price_selectors: tuple[tuple[By, str], ...] = (
-                (By.CSS_SELECTOR, "[data-ref='price']"),
-                (By.CSS_SELECTOR, "[data-testid='price']"),
-                (By.CSS_SELECTOR, "[data-testid='price-value']"),
-                (By.CSS_SELECTOR, "[data-testid='flight-price']"),
-                (By.CSS_SELECTOR, "[data-e2e='flight-price']"),
-                (By.CSS_SELECTOR, ".flight-card__price"),
-                (By.CSS_SELECTOR, ".flight-price"),
-                (By.CSS_SELECTOR, ".price"),
-            )
-            time_selectors: tuple[tuple[By, str], ...] = (
-                (By.CSS_SELECTOR, "[data-ref='flight-time']"),
-                (By.CSS_SELECTOR, "[data-testid='flight-time']"),
-                (By.CSS_SELECTOR, ".flight-card__time"),
-                (By.CSS_SELECTOR, ".flight-time"),
-                (By.CSS_SELECTOR, ".flight-info__hour"),
-            )
-
             if not flight_cards:
-                price_text = self._extract_page_text(wait, price_selectors)
+                price_text = self._extract_page_text(wait, PRICE_SELECTORS)
                 if not price_text:
                     try:
                         body = self.driver.find_element(By.TAG_NAME, "body")
@@ -302,7 +615,7 @@ class RyanairScraper:
                         price_text = self._extract_price_from_text(
                             self._extract_element_text(body)
                         )
-                logging.info("Found price text: %s", price_text)
+                logger.info("Found price text: %s", price_text)
                 return [
                     FlightOption(
                         price=price_text or None,
@@ -314,13 +627,11 @@ class RyanairScraper:
                 ]
 
             options: list[FlightOption] = []
-            for card in flight_cards:
-                price_text = self._extract_text(card, price_selectors)
-                if not price_text:
-                    price_text = self._extract_price_from_text(
-                        self._extract_element_text(card)
-                    )
-                time_texts = self._extract_times(card, time_selectors)
+            for card in self._extract_cards(flight_cards):
+                price_text = card["price"] or self._extract_price_from_text(
+                    card["text"]
+                )
+                time_texts = card["times"]
                 departure_time = time_texts[0] if len(time_texts) > 0 else ""
                 arrival_time = time_texts[1] if len(time_texts) > 1 else ""
                 options.append(
@@ -334,73 +645,310 @@ class RyanairScraper:
                 )
             if len(options) > 1 and len(options) % 2 == 0:
                 midpoint = len(options) // 2
-                logging.info(
+                logger.info(
                     "Detected %s total options; assigning %s outbound and %s return results",
                     len(options),
                     midpoint,
                     len(options) - midpoint,
                 )
                 options = [
-                    FlightOption(
-                        price=option.price,
-                        departure_time=option.departure_time,
-                        arrival_time=option.arrival_time,
-                        currency=option.currency,
+                    replace(
+                        option,
                         flight_date=(
                             config.date_out if idx < midpoint else config.date_return
                         ),
                     )
                     for idx, option in enumerate(options)
                 ]
-            logging.info("Found %s flight options", len(options))
+            logger.info("Found %s flight options", len(options))
             return options
         except TimeoutException:
-            logging.warning("Timed out waiting for price element")
-            self._save_debug_artifacts("missing-price")
-            return [
-                FlightOption(
-                    price=None,
-                    departure_time="",
-                    arrival_time="",
-                    currency=config.currency,
-                    flight_date=config.date_out,
-                )
-            ]
+            logger.warning("Timed out waiting for price element")
+            self._save_debug_artifacts("missing-price", config)
+            return missing_flights(config)
         except WebDriverException:
-            logging.exception("WebDriver error while extracting price")
-            self._save_debug_artifacts("webdriver-error")
-            return [
-                FlightOption(
-                    price=None,
-                    departure_time="",
-                    arrival_time="",
-                    currency=config.currency,
-                    flight_date=config.date_out,
+            logger.exception("WebDriver error while extracting price")
+            self._save_debug_artifacts("webdriver-error", config)
+            return missing_flights(config)
+
+
+class FlightFetcher:
+    """Fetch flights via the API, falling back to a lazily started scraper."""
+
+    def __init__(self, args: argparse.Namespace) -> None:
+        self.args = args
+        self.api = None if args.no_api else RyanairApiClient(args.timeout)
+        self.scraper: Optional[RyanairScraper] = None
+
+    def _profile_dir(self) -> Optional[Path]:
+        if not self.args.profile_dir:
+            return None
+        profile_dir = Path(self.args.profile_dir)
+        # Chrome locks its profile, so each worker process keeps its own.
+        if _WORKER_SLOT is not None:
+            profile_dir = profile_dir / f"worker-{_WORKER_SLOT}"
+        return profile_dir
+
+    def fetch(self, config: SearchConfig) -> list[FlightOption]:
+        if self.api is not None:
+            try:
+                flights = self.api.fetch_return_flights(config)
+            except (OSError, ValueError):
+                logger.exception("Availability API failed; falling back to Selenium")
+            else:
+                # No flights still gets a row so the search isn't lost.
+                return flights or missing_flights(config)
+        if self.scraper is None:
+            self.scraper = RyanairScraper(
+                headless=self.args.headless,
+                debug_dir=Path(self.args.debug_dir) if self.args.debug_dir else None,
+                timeout=self.args.timeout,
+                profile_dir=self._profile_dir(),
+            )
+        return self.scraper.fetch_return_flights(config)
+
+    def discard_scraper(self) -> None:
+        """Drop the browser so the next Selenium search starts a fresh one."""
+        if self.scraper is None:
+            return
+        try:
+            self.scraper.close()
+        except WebDriverException:
+            logger.exception("Failed to shut down Chrome")
+        self.scraper = None
+
+    def close(self) -> None:
+        if self.api is not None:
+            self.api.close()
+        if self.scraper is not None:
+            self.scraper.close()
+            self.scraper = None
+
+
+def _init_worker(
+    slots: multiprocessing.Queue[int], args: argparse.Namespace
+) -> None:
+    """Claim a profile slot and start the fetcher this worker reuses."""
+    global _WORKER_SLOT, _WORKER_FETCHER
+    _WORKER_SLOT = slots.get()
+    _WORKER_FETCHER = FlightFetcher(args)
+    # Pool workers leave through os._exit(), which skips atexit handlers, but
+    # multiprocessing's own finalizers still run.
+    multiprocessing.util.Finalize(None, _close_worker_fetcher, exitpriority=10)
+
+
+def _close_worker_fetcher() -> None:
+    if _WORKER_FETCHER is None:
+        return
+    try:
+        _WORKER_FETCHER.close()
+    except WebDriverException:
+        logger.exception("Failed to shut down Chrome")
+
+
+class FetchRequestHandler(socketserver.StreamRequestHandler):
+    """Answer newline-delimited JSON searches with the daemon's fetcher."""
+
+    server: FetchServer
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            try:
+                config = SearchConfig(**json.loads(line))
+            except (TypeError, ValueError):
+                logger.warning("Ignoring malformed search request: %r", line)
+                return
+            try:
+                flights = self.server.fetcher.fetch(config)
+            except Exception:
+                logger.exception(
+                    "Search %s -> %s failed; restarting the browser",
+                    config.origin,
+                    config.destination,
                 )
-            ]
+                # The driver may be dead; don't let it fail every later search.
+                self.server.fetcher.discard_scraper()
+                flights = missing_flights(config)
+            payload = json.dumps([asdict(flight) for flight in flights])
+            self.wfile.write(payload.encode("utf-8") + b"\n")
+
+
+class FetchServer(socketserver.UnixStreamServer):
+    """Unix-socket server that keeps one warm FlightFetcher between searches."""
+
+    def __init__(self, socket_path: Path, fetcher: FlightFetcher) -> None:
+        self.fetcher = fetcher
+        super().__init__(str(socket_path), FetchRequestHandler)
+
+    def handle_error(self, request: Any, client_address: Any) -> None:
+        logger.exception("Error while serving a search request")
+
+
+class DaemonClient:
+    """Send searches to a running --daemon instead of starting a browser."""
+
+    def __init__(self, socket_path: Path) -> None:
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.connect(str(socket_path))
+        self.stream = self.socket.makefile("rwb")
+
+    def fetch(self, config: SearchConfig) -> list[FlightOption]:
+        request = {
+            item.name: getattr(config, item.name)
+            for item in fields(config)
+            if item.init
+        }
+        self.stream.write(json.dumps(request).encode("utf-8") + b"\n")
+        self.stream.flush()
+        line = self.stream.readline()
+        if not line:
+            raise ConnectionError("Scraper daemon closed the connection")
+        return [FlightOption(**item) for item in json.loads(line)]
+
+    def close(self) -> None:
+        self.stream.close()
+        self.socket.close()
+
+
+def _claim_socket_path(socket_path: Path) -> bool:
+    """Remove a stale daemon socket; False if the path must not be replaced."""
+    try:
+        mode = socket_path.stat().st_mode
+    except FileNotFoundError:
+        return True
+    if not stat.S_ISSOCK(mode):
+        logger.error("%s exists and is not a socket; not replacing it", socket_path)
+        return False
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(str(socket_path))
+        except ConnectionRefusedError:
+            socket_path.unlink()
+            return True
+        except OSError as exc:
+            logger.error("Cannot check existing socket %s: %s", socket_path, exc)
+            return False
+    logger.error("A scraper daemon is already listening on %s", socket_path)
+    return False
+
+
+def serve(args: argparse.Namespace) -> int:
+    """Serve searches on a Unix socket until interrupted."""
+    socket_path = Path(args.socket)
+    if not _claim_socket_path(socket_path):
+        return 1
+    fetcher = FlightFetcher(args)
+    server = FetchServer(socket_path, fetcher)
+    # `kill` sends SIGTERM; handle it like Ctrl-C so Chrome and the socket are
+    # cleaned up below instead of being left behind.
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        logger.info("Serving searches on %s", socket_path)
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Shutting down scraper daemon")
+    finally:
+        server.server_close()
+        fetcher.close()
+        socket_path.unlink(missing_ok=True)
+    return 0
+
+
+def missing_flights(config: SearchConfig) -> list[FlightOption]:
+    """Placeholder row recorded when a search finds no price."""
+    return [
+        FlightOption(
+            price=None,
+            departure_time="",
+            arrival_time="",
+            currency=config.currency,
+            flight_date=config.date_out,
+        )
+    ]
+
+
+def fetch_or_placeholder(
+    fetcher: Union[DaemonClient, FlightFetcher], config: SearchConfig
+) -> list[FlightOption]:
+    """Fetch one search; a failure is logged and recorded without a price."""
+    try:
+        return fetcher.fetch(config)
+    except Exception:
+        logger.exception(
+            "Search %s -> %s (%s/%s) failed",
+            config.origin,
+            config.destination,
+            config.date_out,
+            config.date_return,
+        )
+        if isinstance(fetcher, FlightFetcher):
+            # The driver may be dead; start a fresh one for the next search.
+            fetcher.discard_scraper()
+        return missing_flights(config)
+
+
+def fetch_one(config: SearchConfig, args: argparse.Namespace) -> list[FlightOption]:
+    """Fetch one search in a worker process, reusing the worker's fetcher."""
+    global _WORKER_FETCHER
+    if _WORKER_FETCHER is None:
+        _WORKER_FETCHER = FlightFetcher(args)
+    return fetch_or_placeholder(_WORKER_FETCHER, config)
 
 
 def configure_logging(log_path: Path, verbose: bool) -> None:
     log_path.parent.mkdir(parents=True, exist_ok=True)
-    handlers = [
+    formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
+    for handler in (
         logging.FileHandler(log_path, encoding="utf-8"),
         logging.StreamHandler(),
-    ]
-    logging.basicConfig(
-        level=logging.DEBUG if verbose else logging.INFO,
-        format="%(asctime)s [%(levelname)s] %(message)s",
-        handlers=handlers,
-    )
+    ):
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+    logger.setLevel(logging.DEBUG if verbose else logging.INFO)
+    logger.propagate = False
+
 
+def append_csv(csv_path: Path, rows: Sequence[Sequence[str]]) -> int:
+    """Append rows (values in CSV_HEADERS order), writing the header if new.
 
-def append_csv(csv_path: Path, row: dict[str, str]) -> None:
+    Returns how many rows were written. The file is locked while writing so
+    concurrent runs don't interleave rows.
+    """
+    if not rows:
+        return 0
     csv_path.parent.mkdir(parents=True, exist_ok=True)
-    file_exists = csv_path.exists()
-    with csv_path.open("a", newline="", encoding="utf-8") as handle:
-        writer = csv.DictWriter(handle, fieldnames=CSV_HEADERS)
-        if not file_exists:
-            writer.writeheader()
-        writer.writerow(row)
+    with csv_path.open("a", newline="", encoding="utf-8", buffering=1 << 20) as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        writer = csv.writer(handle)
+        if handle.seek(0, os.SEEK_END) == 0:
+            writer.writerow(CSV_HEADERS)
+        writer.writerows(rows)
+    return len(rows)
+
+
+def load_search_configs(dates_csv: Path, currency: str) -> list[SearchConfig]:
+    """Read origin,destination,date_out,date_return rows into search configs."""
+    configs: list[SearchConfig] = []
+    with dates_csv.open(newline="", encoding="utf-8") as handle:
+        for row in csv.DictReader(handle):
+            values = [
+                (row.get(field) or "").strip()
+                for field in ("origin", "destination", "date_out", "date_return")
+            ]
+            if not all(values):
+                logger.warning("Skipping invalid row: %s", ",".join(values))
+                continue
+            origin, destination, date_out, date_return = values
+            configs.append(
+                SearchConfig(
+                    origin=origin,
+                    destination=destination,
+                    date_out=date_out,
+                    date_return=date_return,
+                    currency=currency,
+                )
+            )
+    return configs
 
 
 def format_flight_datetime(date_str: str, time_str: str) -> str:
@@ -409,6 +957,24 @@ def format_flight_datetime(date_str: str, time_str: str) -> str:
     return date_str
 
 
+def flight_rows(
+    config: SearchConfig, flights: Iterable[FlightOption], timestamp: str
+) -> Iterator[tuple[str, ...]]:
+    for flight in flights:
+        is_return_leg = flight.flight_date == config.date_return
+        origin = config.destination if is_return_leg else config.origin
+        destination = config.origin if is_return_leg else config.destination
+        yield (
+            timestamp,
+            origin,
+            destination,
+            format_flight_datetime(flight.flight_date, flight.departure_time),
+            format_flight_datetime(flight.flight_date, flight.arrival_time),
+            flight.price or "",
+            flight.currency,
+        )
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Track Ryanair return flight prices.")
     parser.add_argument("--origin", default="STN", help="Origin airport IATA code")
@@ -416,6 +982,13 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--date-out", default="2026-08-22", help="Departure date")
     parser.add_argument("--date-return", default="2026-09-04", help="Return date")
     parser.add_argument("--currency", default="GBP", help="Currency to display")
+    parser.add_argument(
+        "--dates-csv",
+        help=(
+            "CSV of origin,destination,date_out,date_return rows to search in one"
+            " run (overrides the single-route flags)"
+        ),
+    )
     parser.add_argument(
         "--csv-path", default="data/flight_prices.csv", help="CSV output path"
     )
@@ -423,57 +996,127 @@ def parse_args() -> argparse.Namespace:
         "--log-path", default="logs/ryanair_scrape.log", help="Log file path"
     )
     parser.add_argument("--timeout", type=int, default=40, help="Page load timeout")
-    parser.add_argument("--headless", action="store_true", help="Run Chrome headless")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of searches to run in parallel worker processes",
+    )
+    parser.add_argument(
+        "--headless",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Run Chrome headless (default: on)",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        default=".cache/chrome-profile",
+        help="Persistent Chrome profile directory (empty string for a fresh one)",
+    )
+    parser.add_argument(
+        "--no-api",
+        action="store_true",
+        help="Skip the availability API and scrape with Selenium",
+    )
     parser.add_argument(
         "--debug-dir",
         default="debug_artifacts",
         help="Directory to store screenshots/html",
     )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Keep one browser warm and serve searches on --socket",
+    )
+    parser.add_argument(
+        "--client",
+        action="store_true",
+        help="Send searches to a running --daemon instead of fetching locally",
+    )
+    parser.add_argument(
+        "--socket",
+        default="/tmp/ryanair.sock",
+        help="Unix socket path used by --daemon and --client",
+    )
     parser.add_argument("--verbose", action="store_true", help="Verbose logging")
     return parser.parse_args()
 
 
+def search_batches(
+    configs: Sequence[SearchConfig],
+    args: argparse.Namespace,
+    timestamp: str,
+    client: Optional[DaemonClient] = None,
+) -> Iterator[list[tuple[str, ...]]]:
+    """Run every search and yield its CSV rows as soon as it completes.
+
+    Searches go to the daemon behind client when one is given.
+    """
+    if args.jobs > 1 and len(configs) > 1 and client is None:
+        slots: multiprocessing.Queue[int] = multiprocessing.Queue()
+        for slot in range(args.jobs):
+            slots.put(slot)
+        with ProcessPoolExecutor(
+            max_workers=args.jobs,
+            initializer=_init_worker,
+            initargs=(slots, args),
+        ) as executor:
+            results = executor.map(partial(fetch_one, args=args), configs)
+            for config, flights in zip(configs, results):
+                yield list(flight_rows(config, flights, timestamp))
+        return
+    fetcher: Union[DaemonClient, FlightFetcher] = (
+        client if client is not None else FlightFetcher(args)
+    )
+    try:
+        for config in configs:
+            flights = fetch_or_placeholder(fetcher, config)
+            yield list(flight_rows(config, flights, timestamp))
+    finally:
+        fetcher.close()
+
+
 def main() -> int:
     args = parse_args()
-    debug_dir = Path(args.debug_dir) if args.debug_dir else None
     configure_logging(Path(args.log_path), args.verbose)
 
-    config = SearchConfig(
-        origin=args.origin,
-        destination=args.destination,
-        date_out=args.date_out,
-        date_return=args.date_return,
-        currency=args.currency,
-    )
+    if args.daemon:
+        return serve(args)
 
-    scraper = RyanairScraper(
-        headless=args.headless, debug_dir=debug_dir, timeout=args.timeout
-    )
-    timestamp = dt.datetime.utcnow().replace(microsecond=0).isoformat()
+    if args.dates_csv:
+        configs = load_search_configs(Path(args.dates_csv), args.currency)
+    else:
+        configs = [
+            SearchConfig(
+                origin=args.origin,
+                destination=args.destination,
+                date_out=args.date_out,
+                date_return=args.date_return,
+                currency=args.currency,
+            )
+        ]
 
-    try:
-        flights = scraper.fetch_return_flights(config)
-        for flight in flights:
-            is_return_leg = flight.flight_date == config.date_return
-            origin = config.destination if is_return_leg else config.origin
-            destination = config.origin if is_return_leg else config.destination
-            row = {
-                "timestamp_utc": timestamp,
-                "origin": origin,
-                "destination": destination,
-                "departure_date": format_flight_datetime(
-                    flight.flight_date, flight.departure_time
-                ),
-                "arrival_date": format_flight_datetime(
-                    flight.flight_date, flight.arrival_time
-                ),
-                "price": flight.price or "",
-                "currency": flight.currency,
-            }
-            append_csv(Path(args.csv_path), row)
-        logging.info("Appended %s rows to %s", len(flights), args.csv_path)
-    finally:
-        scraper.close()
+    client: Optional[DaemonClient] = None
+    if args.client:
+        try:
+            client = DaemonClient(Path(args.socket))
+        except OSError as exc:
+            logger.error(
+                "No scraper daemon reachable on %s (%s); start one with --daemon",
+                args.socket,
+                exc,
+            )
+            return 1
+
+    # No offset suffix: the chart script parses this exact format.
+    timestamp = dt.datetime.now(dt.timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+
+    # Each search's rows are appended as it finishes, so the CSV is only
+    # locked while writing and a crash keeps the searches already done.
+    written = 0
+    for rows in search_batches(configs, args, timestamp, client):
+        written += append_csv(Path(args.csv_path), rows)
+    logger.info("Appended %s rows to %s", written, args.csv_path)
 
     return 0
 
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+
+from plot_flight_prices import PlotConfig, _parse_prices, _slugify, build_charts
+
+
+def test_parse_prices_strips_currency_and_separators() -> None:
+    prices = pd.Series(["£1,234.50", " £66.99 ", "", None, "n/a"])
+
+    parsed = _parse_prices(prices)
+
+    assert parsed.iloc[0] == 1234.5
+    assert parsed.iloc[1] == 66.99
+    assert parsed.iloc[2:].isna().all()
+
+
+def test_slugify_replaces_separators_and_keeps_alphanumerics() -> None:
+    assert _slugify("2026-08-16T06:00") == "2026-08-16T06-00"
+    assert _slugify("Zürich/Milan_BGY") == "Zürich-Milan_BGY"
+
+
+def test_build_charts_writes_one_png_per_series(tmp_path: Path) -> None:
+    csv_path = tmp_path / "prices.csv"
+    csv_path.write_text(
+        "timestamp_utc,origin,destination,departure_date,arrival_date,price,currency\n"
+        "2026-01-15T23:13:48,STN,BGY,2026-08-16T06:00,2026-08-16T08:55,£66.99,GBP\n"
+        "2026-01-16T23:13:48,STN,BGY,2026-08-16T06:00,2026-08-16T08:55,£70.99,GBP\n"
+        "2026-01-15T23:13:48,BGY,STN,2026-09-01T09:20,2026-09-01T10:15,,GBP\n"
+        "2026-01-15T23:13:48,BGY,STN,2026-09-04T09:20,2026-09-04T10:15,£45.00,GBP\n",
+        encoding="utf-8",
+    )
+    output_dir = tmp_path / "charts"
+
+    run = build_charts(
+        PlotConfig(csv_path=csv_path, output_dir=output_dir, currency="GBP")
+    )
+
+    assert run.skipped == []
+    assert sorted(path.name for path in run.generated) == [
+        "BGY_STN_2026-09-04T09-20.png",
+        "STN_BGY_2026-08-16T06-00.png",
+    ]
+    assert all(path.exists() for path in run.generated)
+
+
+def test_build_charts_skips_unchanged_series(tmp_path: Path) -> None:
+    csv_path = tmp_path / "prices.csv"
+    header = "timestamp_utc,origin,destination,departure_date,arrival_date,price,currency\n"
+    csv_path.write_text(
+        header
+        + "2026-01-15T23:13:48,STN,BGY,2026-08-16T06:00,2026-08-16T08:55,£66.99,GBP\n"
+        + "2026-01-15T23:13:48,BGY,STN,2026-09-04T09:20,2026-09-04T10:15,£45.00,GBP\n",
+        encoding="utf-8",
+    )
+    digest_path = tmp_path / "cache" / "chart_digests.json"
+    config = PlotConfig(
+        csv_path=csv_path,
+        output_dir=tmp_path / "charts",
+        currency="GBP",
+        digest_path=digest_path,
+    )
+    inbound, outbound = sorted(build_charts(config).generated)
+    outbound_mtime = outbound.stat().st_mtime_ns
+    inbound_mtime = inbound.stat().st_mtime_ns
+
+    with csv_path.open("a", encoding="utf-8") as handle:
+        handle.write(
+            "2026-01-16T23:13:48,BGY,STN,2026-09-04T09:20,2026-09-04T10:15,£49.00,GBP\n"
+        )
+    run = build_charts(config)
+
+    assert digest_path.exists()
+    assert not list(outbound.parent.glob("*.sha"))
+    assert run.generated == [inbound]
+    assert run.skipped == [outbound]
+    assert outbound.stat().st_mtime_ns == outbound_mtime
+    assert inbound.stat().st_mtime_ns != inbound_mtime
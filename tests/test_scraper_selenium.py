@@ -6,10 +6,9 @@ import pytest
 from selenium import webdriver
 from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 
-from ryanair_scraper import RyanairScraper
+from ryanair_scraper import PRICE_SELECTORS, RyanairScraper
 
 
 @pytest.fixture()
@@ -41,30 +40,22 @@ def test_extract_flight_cards_from_offline_html(selenium_driver: webdriver.Chrom
 
     assert len(cards) == 2
 
-    price_selectors = (
-        (By.CSS_SELECTOR, "[data-ref='price']"),
-        (By.CSS_SELECTOR, "[data-testid='price']"),
-        (By.CSS_SELECTOR, "[data-testid='price-value']"),
-        (By.CSS_SELECTOR, "[data-testid='flight-price']"),
-        (By.CSS_SELECTOR, "[data-e2e='flight-price']"),
-        (By.CSS_SELECTOR, ".flight-card__price"),
-        (By.CSS_SELECTOR, ".flight-price"),
-        (By.CSS_SELECTOR, ".price"),
-    )
-    time_selectors = (
-        (By.CSS_SELECTOR, "[data-ref='flight-time']"),
-        (By.CSS_SELECTOR, "[data-testid='flight-time']"),
-        (By.CSS_SELECTOR, ".flight-card__time"),
-        (By.CSS_SELECTOR, ".flight-time"),
-        (By.CSS_SELECTOR, ".flight-info__hour"),
-    )
-
-    first_price = scraper._extract_text(cards[0], price_selectors)
-    first_times = scraper._extract_times(cards[0], time_selectors)
-    second_price = scraper._extract_text(cards[1], price_selectors)
-    second_times = scraper._extract_times(cards[1], time_selectors)
-
-    assert first_price == "£123.45"
-    assert first_times == ["06:30", "08:45"]
-    assert second_price == "£156.00"
-    assert second_times == ["12:10", "14:25"]
+    first, second = scraper._extract_cards(cards)
+
+    assert first["price"] == "£123.45"
+    assert first["times"] == ["06:30", "08:45"]
+    assert second["price"] == "£156.00"
+    assert second["times"] == ["12:10", "14:25"]
+
+
+def test_extract_page_text_returns_first_price_on_page(
+    selenium_driver: webdriver.Chrome,
+) -> None:
+    fixture_path = Path(__file__).parent / "fixtures" / "ryanair_flight_cards.html"
+    selenium_driver.get(fixture_path.resolve().as_uri())
+
+    scraper = RyanairScraper.__new__(RyanairScraper)
+    scraper.driver = selenium_driver
+
+    wait = WebDriverWait(selenium_driver, 10)
+    assert scraper._extract_page_text(wait, PRICE_SELECTORS) == "£123.45"
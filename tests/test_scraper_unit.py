@@ -1,19 +1,74 @@
 from __future__ import annotations
 
+import argparse
+import http.client
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import ClassVar
 
-from ryanair_scraper import SearchConfig, append_csv, RyanairScraper
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+import ryanair_scraper
+from ryanair_scraper import (
+    COOKIE_SELECTORS,
+    DaemonClient,
+    FetchServer,
+    FLIGHT_CARD_SELECTORS,
+    FlightFetcher,
+    SearchConfig,
+    FlightOption,
+    append_csv,
+    fetch_one,
+    flight_rows,
+    load_search_configs,
+    parse_availability,
+    RyanairApiClient,
+    RyanairScraper,
+    _any_present,
+    _claim_socket_path,
+)
 
 
 class DummyElement:
     def __init__(self, text: str, attributes: dict[str, str] | None = None) -> None:
         self.text = text
         self._attributes = attributes or {}
+        self.probed: list[str] = []
 
     def get_attribute(self, name: str) -> str | None:
+        self.probed.append(name)
         return self._attributes.get(name)
 
 
+class DummyButton:
+    def __init__(self) -> None:
+        self.clicked = False
+
+    def is_displayed(self) -> bool:
+        return True
+
+    def is_enabled(self) -> bool:
+        return True
+
+    def click(self) -> None:
+        self.clicked = True
+
+
+class DummyDriver:
+    def __init__(self, selector: str) -> None:
+        self.selector = selector
+        self.button = DummyButton()
+        self.lookups: list[str] = []
+
+    def find_elements(self, by: str, selector: str) -> list[DummyButton]:
+        self.lookups.append(selector)
+        if selector != self.selector:
+            return []
+        return [self.button]
+
+
 def test_search_url_contains_expected_params() -> None:
     config = SearchConfig(
         origin="STN",
@@ -35,6 +90,129 @@ def test_search_url_contains_expected_params() -> None:
     assert "currency=EUR" in url
 
 
+def test_availability_url_contains_expected_params() -> None:
+    config = SearchConfig(
+        origin="STN",
+        destination="BGY",
+        date_out="2024-08-22",
+        date_return="2024-09-04",
+        adults=2,
+    )
+
+    url = config.to_availability_url()
+
+    assert url.startswith("https://www.ryanair.com/api/booking/v4/en-gb/availability?")
+    assert "Origin=STN" in url
+    assert "Destination=BGY" in url
+    assert "DateOut=2024-08-22" in url
+    assert "DateIn=2024-09-04" in url
+    assert "ADT=2" in url
+    assert "RoundTrip=true" in url
+
+
+class DummyResponse:
+    def __init__(self, status: int, body: bytes) -> None:
+        self.status = status
+        self.body = body
+
+    def read(self) -> bytes:
+        return self.body
+
+
+class DummyConnection:
+    instances: ClassVar[list[DummyConnection]] = []
+
+    def __init__(self, host: str, timeout: int) -> None:
+        self.host = host
+        self.requests: list[str] = []
+        self.closed = False
+        DummyConnection.instances.append(self)
+
+    def request(self, method: str, target: str, headers: dict[str, str]) -> None:
+        self.requests.append(target)
+
+    def getresponse(self) -> DummyResponse:
+        return DummyResponse(200, b'{"currency": "GBP", "trips": []}')
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def test_api_client_reuses_connection_across_searches(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(DummyConnection, "instances", [])
+    monkeypatch.setattr(http.client, "HTTPSConnection", DummyConnection)
+    client = RyanairApiClient(timeout=5)
+
+    client.fetch_return_flights(SearchConfig("STN", "BGY", "2026-04-16", "2026-05-01"))
+    client.fetch_return_flights(SearchConfig("STN", "BGY", "2026-04-17", "2026-05-02"))
+    client.close()
+
+    (connection,) = DummyConnection.instances
+    assert connection.host == "www.ryanair.com"
+    assert len(connection.requests) == 2
+    assert connection.closed
+
+
+def test_parse_availability_assigns_legs_and_formats_prices() -> None:
+    config = SearchConfig(
+        origin="STN",
+        destination="BGY",
+        date_out="2024-08-22",
+        date_return="2024-09-04",
+    )
+    payload = {
+        "currency": "GBP",
+        "trips": [
+            {
+                "origin": "STN",
+                "destination": "BGY",
+                "dates": [
+                    {
+                        "flights": [
+                            {
+                                "time": [
+                                    "2024-08-22T06:30:00.000",
+                                    "2024-08-22T08:45:00.000",
+                                ],
+                                "regularFare": {"fares": [{"amount": 123.45}]},
+                            }
+                        ]
+                    }
+                ],
+            },
+            {
+                "origin": "BGY",
+                "destination": "STN",
+                "dates": [
+                    {
+                        "flights": [
+                            {
+                                "time": [
+                                    "2024-09-04T12:10:00.000",
+                                    "2024-09-04T14:25:00.000",
+                                ],
+                                "regularFare": None,
+                            }
+                        ]
+                    }
+                ],
+            },
+        ],
+    }
+
+    outbound, inbound = parse_availability(payload, config)
+
+    assert outbound.price == "£123.45"
+    assert outbound.departure_time == "06:30"
+    assert outbound.arrival_time == "08:45"
+    assert outbound.flight_date == "2024-08-22"
+    assert inbound.price is None
+    assert inbound.departure_time == "12:10"
+    assert inbound.flight_date == "2024-09-04"
+
+
 def test_clean_text_collapses_whitespace() -> None:
     assert RyanairScraper._clean_text("  Hello\n  world \t") == "Hello world"
 
@@ -46,6 +224,14 @@ def test_extract_element_text_prefers_first_non_empty() -> None:
     assert scraper._extract_element_text(element) == "£199.99"
 
 
+def test_extract_element_text_skips_attribute_probes_when_text_is_set() -> None:
+    element = DummyElement(" £66.99 ", {"aria-label": "£1.00"})
+    scraper = RyanairScraper.__new__(RyanairScraper)
+
+    assert scraper._extract_element_text(element) == "£66.99"
+    assert element.probed == []
+
+
 def test_extract_price_from_text_matches_currency() -> None:
     assert RyanairScraper._extract_price_from_text("Fly now for £19.99!") == "£19.99"
     assert (
@@ -59,30 +245,271 @@ def test_append_csv_writes_header_once(tmp_path: Path) -> None:
 
     append_csv(
         csv_path,
-        {
-            "timestamp_utc": "2024-01-01T00:00:00",
-            "origin": "STN",
-            "destination": "BGY",
-            "departure_date": "2024-08-22T06:30",
-            "arrival_date": "2024-08-22T08:45",
-            "price": "£123.45",
-            "currency": "GBP",
-        },
+        [
+            (
+                "2024-01-01T00:00:00",
+                "STN",
+                "BGY",
+                "2024-08-22T06:30",
+                "2024-08-22T08:45",
+                "£123.45",
+                "GBP",
+            )
+        ],
     )
     append_csv(
         csv_path,
-        {
-            "timestamp_utc": "2024-01-02T00:00:00",
-            "origin": "STN",
-            "destination": "BGY",
-            "departure_date": "2024-08-22T12:10",
-            "arrival_date": "2024-08-22T14:25",
-            "price": "£156.00",
-            "currency": "GBP",
-        },
+        [
+            (
+                "2024-01-02T00:00:00",
+                "STN",
+                "BGY",
+                "2024-08-22T12:10",
+                "2024-08-22T14:25",
+                "£156.00",
+                "GBP",
+            ),
+            (
+                "2024-01-02T00:00:00",
+                "BGY",
+                "STN",
+                "2024-09-04T09:20",
+                "2024-09-04T10:15",
+                "£45.00",
+                "GBP",
+            ),
+        ],
     )
 
     lines = csv_path.read_text(encoding="utf-8").splitlines()
 
     assert lines[0].startswith("timestamp_utc,origin,destination,departure_date")
-    assert len(lines) == 3
+    assert len(lines) == 4
+
+
+def test_append_csv_skips_empty_batches(tmp_path: Path) -> None:
+    csv_path = tmp_path / "prices.csv"
+
+    assert append_csv(csv_path, []) == 0
+    assert not csv_path.exists()
+
+
+def test_load_search_configs_skips_incomplete_rows(tmp_path: Path) -> None:
+    dates_csv = tmp_path / "flight_dates.csv"
+    dates_csv.write_text(
+        "origin,destination,date_out,date_return\n"
+        "STN,BGY,2026-04-16,2026-05-01\n"
+        "STN,,2026-04-17,2026-05-02\n"
+        "BGY,STN,2026-05-16,2026-06-01\n",
+        encoding="utf-8",
+    )
+
+    configs = load_search_configs(dates_csv, "GBP")
+
+    assert configs == [
+        SearchConfig("STN", "BGY", "2026-04-16", "2026-05-01", currency="GBP"),
+        SearchConfig("BGY", "STN", "2026-05-16", "2026-06-01", currency="GBP"),
+    ]
+
+
+def test_accept_cookies_clicks_first_visible_button() -> None:
+    _, selector = COOKIE_SELECTORS[-1]
+    scraper = RyanairScraper.__new__(RyanairScraper)
+    scraper.driver = DummyDriver(selector)
+
+    scraper._accept_cookies()
+
+    assert scraper.driver.button.clicked
+    assert scraper.driver.lookups == [s for _, s in COOKIE_SELECTORS]
+
+
+class DummyPageDriver:
+    page_source = "<html></html>"
+
+    def get_screenshot_as_png(self) -> bytes:
+        return b"png"
+
+
+def test_save_debug_artifacts_writes_in_background(tmp_path: Path) -> None:
+    scraper = RyanairScraper.__new__(RyanairScraper)
+    scraper.debug_dir = tmp_path
+    scraper.driver = DummyPageDriver()
+    scraper._debug_pool = ThreadPoolExecutor(max_workers=1)
+
+    config = SearchConfig("STN", "BGY", "2026-04-16", "2026-05-01")
+    scraper._save_debug_artifacts("timeout", config)
+    scraper._debug_pool.shutdown(wait=True)
+
+    prefix = "timeout_STN-BGY_2026-04-16_2026-05-01_"
+    (screenshot,) = scraper.debug_dir.glob(f"{prefix}*.png")
+    (html,) = scraper.debug_dir.glob(f"{prefix}*.html")
+    assert screenshot.read_bytes() == b"png"
+    assert html.read_text(encoding="utf-8") == "<html></html>"
+
+
+class DummyCardDriver:
+    def __init__(self, matches: dict[str, list[str]]) -> None:
+        self.matches = matches
+        self.queries: list[str] = []
+
+    def find_elements(self, by: str, selector: str) -> list[str]:
+        self.queries.append(selector)
+        if "," in selector:
+            return [card for cards in self.matches.values() for card in cards]
+        return self.matches.get(selector, [])
+
+
+def test_any_present_polls_the_selector_union_once() -> None:
+    condition = _any_present(FLIGHT_CARD_SELECTORS)
+    empty = DummyCardDriver({})
+    driver = DummyCardDriver(
+        {".flight-card": ["a"], "[data-testid='flight-card']": ["b"]}
+    )
+
+    assert condition(empty) is False
+    assert len(empty.queries) == 1
+    assert condition(driver) == ["b"]
+
+
+def test_flight_rows_swaps_route_for_return_leg() -> None:
+    config = SearchConfig("STN", "BGY", "2026-04-16", "2026-05-01")
+    flights = [
+        FlightOption("£66.99", "06:00", "08:55", "GBP", "2026-04-16"),
+        FlightOption(None, "", "", "GBP", "2026-05-01"),
+    ]
+
+    rows = list(flight_rows(config, flights, "2026-01-01T00:00:00"))
+
+    assert rows == [
+        (
+            "2026-01-01T00:00:00",
+            "STN",
+            "BGY",
+            "2026-04-16T06:00",
+            "2026-04-16T08:55",
+            "£66.99",
+            "GBP",
+        ),
+        ("2026-01-01T00:00:00", "BGY", "STN", "2026-05-01", "2026-05-01", "", "GBP"),
+    ]
+
+
+def test_claim_socket_path_keeps_non_socket_files(tmp_path: Path) -> None:
+    data_path = tmp_path / "flight_prices.csv"
+    data_path.write_text("keep me", encoding="utf-8")
+
+    assert _claim_socket_path(tmp_path / "missing.sock")
+    assert not _claim_socket_path(data_path)
+    assert data_path.read_text(encoding="utf-8") == "keep me"
+
+
+def test_profile_lock_is_held_until_released(tmp_path: Path) -> None:
+    profile_dir = tmp_path / "chrome-profile"
+    first = RyanairScraper.__new__(RyanairScraper)
+    first._profile_lock = None
+    second = RyanairScraper.__new__(RyanairScraper)
+    second._profile_lock = None
+
+    assert first._lock_profile(profile_dir)
+    assert not second._lock_profile(profile_dir)
+
+    first._unlock_profile()
+    assert second._lock_profile(profile_dir)
+    second._unlock_profile()
+
+
+class DummyFetcher:
+    def fetch(self, config: SearchConfig) -> list[FlightOption]:
+        return [
+            FlightOption("£66.99", "06:00", "08:55", config.currency, config.date_out)
+        ]
+
+
+def test_daemon_client_round_trips_searches(tmp_path: Path) -> None:
+    socket_path = tmp_path / "ryanair.sock"
+    config = SearchConfig("STN", "BGY", "2026-04-16", "2026-05-01")
+
+    with FetchServer(socket_path, DummyFetcher()) as server:
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        client = DaemonClient(socket_path)
+        try:
+            first = client.fetch(config)
+            second = client.fetch(config)
+        finally:
+            client.close()
+            server.shutdown()
+
+    assert first == second == [
+        FlightOption("£66.99", "06:00", "08:55", "GBP", "2026-04-16")
+    ]
+
+
+def test_fetch_one_records_a_placeholder_when_the_search_fails(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def fail(self: FlightFetcher, config: SearchConfig) -> list[FlightOption]:
+        raise WebDriverException("Chrome failed to start")
+
+    monkeypatch.setattr(FlightFetcher, "fetch", fail)
+    monkeypatch.setattr(ryanair_scraper, "_WORKER_FETCHER", None)
+    args = argparse.Namespace(no_api=True)
+    config = SearchConfig("STN", "BGY", "2026-04-16", "2026-05-01")
+
+    assert fetch_one(config, args) == [
+        FlightOption(None, "", "", "GBP", "2026-04-16")
+    ]
+
+
+class FailingFetcher:
+    def __init__(self) -> None:
+        self.discarded = False
+
+    def fetch(self, config: SearchConfig) -> list[FlightOption]:
+        raise WebDriverException("chrome not reachable")
+
+    def discard_scraper(self) -> None:
+        self.discarded = True
+
+
+def test_daemon_replies_with_placeholder_when_a_search_fails(tmp_path: Path) -> None:
+    socket_path = tmp_path / "ryanair.sock"
+    config = SearchConfig("STN", "BGY", "2026-04-16", "2026-05-01")
+    fetcher = FailingFetcher()
+
+    with FetchServer(socket_path, fetcher) as server:
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        client = DaemonClient(socket_path)
+        try:
+            flights = client.fetch(config)
+        finally:
+            client.close()
+            server.shutdown()
+
+    assert flights == [FlightOption(None, "", "", "GBP", "2026-04-16")]
+    assert fetcher.discarded
+
+
+def test_api_client_rejects_error_shaped_payload(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    client = RyanairApiClient(timeout=5)
+    monkeypatch.setattr(client, "_get", lambda url: b'{"message": "Rate limited"}')
+    config = SearchConfig("STN", "BGY", "2026-04-16", "2026-05-01")
+
+    with pytest.raises(ValueError):
+        client.fetch_return_flights(config)
+
+
+def test_fetcher_records_placeholder_for_empty_api_answer(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    fetcher = FlightFetcher(argparse.Namespace(no_api=False, timeout=5))
+    assert fetcher.api is not None
+    payload = b'{"currency": "GBP", "trips": [{"origin": "STN", "dates": []}]}'
+    monkeypatch.setattr(fetcher.api, "_get", lambda url: payload)
+
+    flights = fetcher.fetch(SearchConfig("STN", "BGY", "2026-04-16", "2026-05-01"))
+
+    assert flights == [FlightOption(None, "", "", "GBP", "2026-04-16")]